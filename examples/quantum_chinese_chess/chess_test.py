@@ -12,13 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import pytest
-import io
-import sys
 from .test_utils import (
     set_board,
     assert_sample_distribution,
     locations_to_bitboard,
     assert_samples_in,
+    stub_input,
 )
 from unitary import alpha
 from .chess import QuantumChineseChess
@@ -34,85 +33,81 @@ from .enums import (
 )
 
 
-def test_game_init(monkeypatch):
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    output = io.StringIO()
-    sys.stdout = output
+def _move(board, source, target, is_entangled=False):
+    """Classically moves the piece at `source` to `target` and empties `source`.
+    The moved piece is marked as entangled if `is_entangled` is True.
+    """
+    board[target].reset(board[source])
+    if is_entangled:
+        board[target].is_entangled = True
+    board[source].reset()
+
+
+@pytest.fixture
+def game(monkeypatch):
+    """Returns a freshly constructed game."""
+    stub_input(monkeypatch, ["y", "n", "Bob", "Ben"])
+    return QuantumChineseChess()
+
+
+def test_game_init(monkeypatch, capsys):
+    stub_input(monkeypatch, ["y", "n", "Bob", "Ben"])
     game = QuantumChineseChess()
     assert game.lang == Language.ZH
     assert game.terminal == TerminalType.MAC_OR_LINUX
     assert game.players_name == ["Bob", "Ben"]
     assert game.current_player == 0
-    assert "Welcome" in output.getvalue()
-    sys.stdout = sys.__stdout__
+    assert "Welcome" in capsys.readouterr().out
 
 
-def test_parse_input_string_success(monkeypatch):
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
+def test_parse_input_string_success(game):
     assert game.parse_input_string("a1b1") == (["a1"], ["b1"])
     assert game.parse_input_string("a1b1^c2") == (["a1", "b1"], ["c2"])
     assert game.parse_input_string("a1^b1c2") == (["a1"], ["b1", "c2"])
 
 
-def test_parse_input_string_fail(monkeypatch):
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
-    with pytest.raises(ValueError, match="Invalid sources/targets string "):
-        game.parse_input_string("a1^b1")
-    with pytest.raises(ValueError, match="Invalid sources/targets string "):
-        game.parse_input_string("a^1b1c2")
-    with pytest.raises(ValueError, match="Two sources should not be the same."):
-        game.parse_input_string("a1a1^c2")
-    with pytest.raises(ValueError, match="Two targets should not be the same."):
-        game.parse_input_string("a1^c2c2")
-    with pytest.raises(ValueError, match="Invalid sources/targets string "):
-        game.parse_input_string("a1b")
-    with pytest.raises(ValueError, match="Source and target should not be the same."):
-        game.parse_input_string("a1a1")
-    with pytest.raises(ValueError, match="Invalid location string."):
-        game.parse_input_string("a1n1")
-
-
-def test_apply_move_fail(monkeypatch):
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
-    with pytest.raises(ValueError, match="Could not move empty piece."):
-        game.apply_move("a8b8")
-    with pytest.raises(ValueError, match="Could not move the other player's piece."):
-        game.apply_move("a9b8")
-    with pytest.raises(ValueError, match="Two sources need to be the same type."):
-        game.apply_move("a0a3^a4")
-    with pytest.raises(ValueError, match="Two targets need to be the same type."):
-        game.apply_move("b2^a2h2")
-    with pytest.raises(ValueError, match="Two targets need to be the same color."):
-        game.apply_move("b2^b7h2")
-
-
-def test_game_invalid_move(monkeypatch):
-    output = io.StringIO()
-    sys.stdout = output
-    inputs = iter(["y", "n", "Bob", "Ben", "a1n1", "exit"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
+@pytest.mark.parametrize(
+    "input_string, message",
+    [
+        ("a1^b1", "Invalid sources/targets string "),
+        ("a^1b1c2", "Invalid sources/targets string "),
+        ("a1a1^c2", "Two sources should not be the same."),
+        ("a1^c2c2", "Two targets should not be the same."),
+        ("a1b", "Invalid sources/targets string "),
+        ("a1a1", "Source and target should not be the same."),
+        ("a1n1", "Invalid location string."),
+    ],
+)
+def test_parse_input_string_fail(game, input_string, message):
+    with pytest.raises(ValueError, match=message):
+        game.parse_input_string(input_string)
+
+
+@pytest.mark.parametrize(
+    "input_string, message",
+    [
+        ("a8b8", "Could not move empty piece."),
+        ("a9b8", "Could not move the other player's piece."),
+        ("a0a3^a4", "Two sources need to be the same type."),
+        ("b2^a2h2", "Two targets need to be the same type."),
+        ("b2^b7h2", "Two targets need to be the same color."),
+    ],
+)
+def test_apply_move_fail(game, input_string, message):
+    with pytest.raises(ValueError, match=message):
+        game.apply_move(input_string)
+
+
+def test_game_invalid_move(monkeypatch, capsys, game):
+    stub_input(monkeypatch, ["a1n1", "exit"])
     game.play()
     assert (
         "Invalid location string. Make sure they are from a0 to i9."
-        in output.getvalue()
+        in capsys.readouterr().out
     )
-    sys.stdout = sys.__stdout__
 
 
-def test_check_classical_rule(monkeypatch):
-    output = io.StringIO()
-    sys.stdout = output
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
+def test_check_classical_rule(game):
     board = game.board.board
     # The move is blocked by classical path piece.
     with pytest.raises(ValueError, match="The path is blocked."):
@@ -159,8 +154,7 @@ def test_check_classical_rule(monkeypatch):
     with pytest.raises(ValueError, match="KING cannot move like this."):
         game.check_classical_rule("e9", "d8", [])
     board["c0"].reset()
-    board["d0"].reset(board["e0"])
-    board["e0"].reset()
+    _move(board, "e0", "d0")
     with pytest.raises(ValueError, match="KING cannot leave the palace."):
         game.check_classical_rule("d0", "c0", [])
 
@@ -173,8 +167,7 @@ def test_check_classical_rule(monkeypatch):
     with pytest.raises(ValueError, match="CANNON cannot fire like this."):
         game.check_classical_rule("b2", "b9", ["b5", "b7"])
     # Cannon cannot fire to a piece with same color.
-    board["b3"].reset(board["b2"])
-    board["b2"].reset()
+    _move(board, "b2", "b3")
     board["e3"].is_entangled = True
     with pytest.raises(
         ValueError, match="CANNON cannot fire to a piece with same color."
@@ -200,18 +193,12 @@ def test_check_classical_rule(monkeypatch):
     with pytest.raises(ValueError, match="PAWN can not move backward."):
         game.check_classical_rule("g6", "g7", [])
     # After crossing the rive the pawn could move horizontally.
-    board["c4"].reset(board["c6"])
-    board["c6"].reset()
+    _move(board, "c6", "c4")
     game.check_classical_rule("c4", "b4", [])
     game.check_classical_rule("c4", "d4", [])
 
 
-def test_classify_move_fail(monkeypatch):
-    output = io.StringIO()
-    sys.stdout = output
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
+def test_classify_move_fail(game):
     board = game.board.board
     with pytest.raises(
         ValueError, match="CANNON could not fire/capture without a cannon platform."
@@ -223,21 +210,13 @@ def test_classify_move_fail(monkeypatch):
     ):
         game.classify_move(["b2", "h2"], ["e2"], [], [], [], [])
 
-    board["c0"].reset(board["b7"])
-    board["c0"].is_entangled = True
-    board["b7"].reset()
-    board["g0"].reset(board["h7"])
-    board["g0"].is_entangled = True
-    board["h7"].reset()
+    _move(board, "b7", "c0", is_entangled=True)
+    _move(board, "h7", "g0", is_entangled=True)
     with pytest.raises(ValueError, match="Currently CANNON cannot merge while firing."):
         game.classify_move(["c0", "g0"], ["e0"], ["d0"], [], ["f0"], [])
 
-    board["b3"].reset(board["b2"])
-    board["b3"].is_entangled = True
-    board["b2"].reset()
-    board["d3"].reset(board["h2"])
-    board["d3"].is_entangled = True
-    board["h2"].reset()
+    _move(board, "b2", "b3", is_entangled=True)
+    _move(board, "h2", "d3", is_entangled=True)
     with pytest.raises(
         ValueError, match="Currently we could only merge into an empty piece."
     ):
@@ -258,12 +237,7 @@ def test_classify_move_fail(monkeypatch):
         game.classify_move(["e0"], ["d0", "f0"], [], [], [], [])
 
 
-def test_classify_move_success(monkeypatch):
-    output = io.StringIO()
-    sys.stdout = output
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
+def test_classify_move_success(game):
     board = game.board.board
     # classical
     assert game.classify_move(["h9"], ["g7"], [], [], [], []) == (
@@ -295,9 +269,7 @@ def test_classify_move_success(monkeypatch):
     )
 
     # jump capture
-    board["g4"].reset(board["g6"])
-    board["g4"].is_entangled = True
-    board["g6"].reset()
+    _move(board, "g6", "g4", is_entangled=True)
     assert game.classify_move(["g4"], ["g3"], [], [], [], []) == (
         MoveType.JUMP,
         MoveVariant.CAPTURE,
@@ -310,9 +282,7 @@ def test_classify_move_success(monkeypatch):
     )
 
     # slide excluded
-    board["i7"].reset(board["h7"])
-    board["i7"].is_entangled = True
-    board["h7"].reset()
+    _move(board, "h7", "i7", is_entangled=True)
     board["i6"].is_entangled = True
     assert game.classify_move(["i9"], ["i6"], [], ["i7"], [], []) == (
         MoveType.SLIDE,
@@ -332,8 +302,7 @@ def test_classify_move_success(monkeypatch):
     )
 
     # split_slide basic
-    board["d3"].reset(board["h2"])
-    board["h2"].reset()
+    _move(board, "h2", "d3")
     board["c3"].is_entangled = True
     board["e3"].is_entangled = True
     assert game.classify_move(["d3"], ["b3", "f3"], [], ["c3"], [], ["e3"]) == (
@@ -366,12 +335,7 @@ def test_classify_move_success(monkeypatch):
     )
 
 
-def test_update_board_by_sampling(monkeypatch):
-    output = io.StringIO()
-    sys.stdout = output
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
+def test_update_board_by_sampling(game):
     board = game.board.board
 
     board.unhook(board["a0"])
@@ -391,10 +355,7 @@ def test_update_board_by_sampling(monkeypatch):
     assert board["a1"].is_entangled == False
 
 
-def test_undo_single_effect_per_move(monkeypatch):
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
+def test_undo_single_effect_per_move(game):
     board = set_board(["a1", "b1", "c1"])
     game.board = board
     world = board.board
@@ -432,10 +393,7 @@ def test_undo_single_effect_per_move(monkeypatch):
     assert_samples_in(board, {locations_to_bitboard(["a1", "b1", "c1"]): 1.0})
 
 
-def test_undo_multiple_effects_per_move(monkeypatch):
-    inputs = iter(["y", "n", "Bob", "Ben"])
-    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
-    game = QuantumChineseChess()
+def test_undo_multiple_effects_per_move(game):
     board = set_board(["a1", "b1", "c1"])
     game.board = board
     world = board.board
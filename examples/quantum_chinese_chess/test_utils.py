@@ -11,9 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List, Dict
+from typing import Iterable, List, Dict
 from collections import defaultdict
+from unittest.mock import MagicMock
 
+import pytest
 from scipy.stats import chisquare
 from unitary import alpha
 from unitary.alpha import QuantumObject, QuantumWorld
@@ -39,6 +41,15 @@ def set_board(positions: List[str]) -> Board:
     return board
 
 
+def stub_input(monkeypatch: pytest.MonkeyPatch, values: Iterable[str]) -> MagicMock:
+    """Replaces the builtin `input` so that it returns the given `values` in
+    order. Returns the mock, whose `call_args_list` records the prompts.
+    """
+    mock_input = MagicMock(side_effect=list(values))
+    monkeypatch.setattr("builtins.input", mock_input)
+    return mock_input
+
+
 def location_to_bit(location: str) -> int:
     """Transform location notation (e.g. "a3") into a bitboard bit number.
     The return value ranges from 0 to 89.